@@ -14,15 +14,47 @@ The storage backend is abstracted so SQLite can be swapped for PostgreSQL,
 MySQL, or any other database later.
 """
 
+import atexit
+import functools
+import gzip
+import hashlib
 import json
+import math
+import mimetypes
 import os
+import queue
 import sys
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import unquote, unquote_plus
 import sqlite3
 from datetime import datetime
 from abc import ABC, abstractmethod
-import statistics
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the standard library
+    orjson = None
+
+
+if orjson:
+    encode_json = orjson.dumps
+    decode_json = orjson.loads
+else:
+    # json.dumps builds a fresh encoder whenever options are passed, so
+    # keep one configured instance around instead
+    _json_encoder = json.JSONEncoder(separators=(',', ':'))
+
+    def encode_json(data):
+        """Serialize data as compact JSON bytes."""
+        return _json_encoder.encode(data).encode()
+
+    decode_json = json.loads
 
 
 # =============================================================================
@@ -44,7 +76,7 @@ class StorageBackend(ABC):
 
     @abstractmethod
     def save_score(self, score, wave, accuracy, difficulty, player_name=None):
-        """Save a score. Returns the score ID."""
+        """Save a score. Returns (score ID, current global best)."""
         pass
 
     @abstractmethod
@@ -52,256 +84,628 @@ class StorageBackend(ABC):
         """Get a player's best score."""
         pass
 
+    @abstractmethod
+    def get_high_scores_json(self, limit=10, difficulty=None):
+        """Get top high scores as an encoded JSON list."""
+        pass
+
+    @abstractmethod
+    def save_scores_bulk(self, records):
+        """Save several scores at once. Returns (score IDs, current global best)."""
+        pass
+
+    @abstractmethod
+    def get_global_best(self):
+        """Get the single highest score ever."""
+        pass
+
+    @abstractmethod
+    def compute_stats(self, difficulty):
+        """Compute accuracy statistics for a difficulty."""
+        pass
+
+    @abstractmethod
+    def cached_json(self, key, build):
+        """Return build() as encoded JSON bytes, possibly from a cache."""
+        pass
+
+    @abstractmethod
+    def queue_accuracy_report(self, difficulty):
+        """Schedule an accuracy report for a difficulty."""
+        pass
+
+
+# Hot-path statements. sqlite3 caches prepared statements by SQL text, so
+# sharing one string per query keeps every call a cache hit.
+SQL_INSERT_SCORE = '''
+    INSERT INTO scores (player_name, score, wave, accuracy, difficulty)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+SQL_TOP_SCORES = '''
+    SELECT id, player_name, score, wave, accuracy, difficulty, created_at
+    FROM scores
+    ORDER BY score DESC
+    LIMIT ?
+'''
+
+SQL_TOP_SCORES_BY_DIFFICULTY = '''
+    SELECT id, player_name, score, wave, accuracy, difficulty, created_at
+    FROM scores
+    WHERE difficulty = ?
+    ORDER BY score DESC
+    LIMIT ?
+'''
+
+SQL_LOAD_LEADERBOARD = '''
+    SELECT json FROM leaderboard_cache WHERE key = ?
+'''
+
+SQL_STORE_LEADERBOARD = '''
+    INSERT OR REPLACE INTO leaderboard_cache (key, json, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+'''
+
+SQL_PLAYER_BEST = '''
+    SELECT id, player_name, score, wave, accuracy, difficulty, created_at
+    FROM scores
+    WHERE player_name = ?
+    ORDER BY score DESC
+    LIMIT 1
+'''
+
+SQL_GLOBAL_BEST = '''
+    SELECT id, player_name, score, wave, accuracy, difficulty, created_at
+    FROM scores
+    ORDER BY score DESC
+    LIMIT 1
+'''
+
+
+# Accuracy stats are the most recent games at a difficulty that report an
+# accuracy; idx_scores_difficulty_recent serves the ordering. created_at
+# only has one-second resolution, so id breaks ties in insert order.
+SQL_SELECT_STATS = '''
+    SELECT accuracy, score, wave, created_at
+    FROM scores
+    WHERE difficulty = ? AND accuracy IS NOT NULL
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+'''
+
+
+# Difficulty levels that accuracy stats are tracked for
+DIFFICULTIES = frozenset({'beginner', 'normal', 'expert'})
+
+# Leaderboard length served from the leaderboard_cache table
+LEADERBOARD_SIZE = 10
+
+# leaderboard_cache rows kept: one per difficulty plus '' for all scores.
+# Other difficulty strings clients send are queried directly.
+LEADERBOARD_KEYS = DIFFICULTIES | {''}
+
+# Most recent games per difficulty that accuracy stats are computed over
+STATS_WINDOW = 200
+
+# How long cached reads stay valid if no write invalidates them first
+CACHE_TTL = 30
+
+# Most cached reads kept at once. Keys include client-supplied values such
+# as limit and player name, so the cache evicts least recently used entries.
+CACHE_MAX_ENTRIES = 256
+
+# Background accuracy reports are skipped unless this many more games have
+# been recorded or the average accuracy moved by more than this many points
+REPORT_EVERY_GAMES = 10
+REPORT_AVG_SHIFT = 0.5
+
+
+def ttl_cached(method):
+    """Cache a backend read for CACHE_TTL seconds, keyed on its arguments.
+
+    The backend clears the cache on every write, so entries only expire on
+    their own when something outside this process changes the database.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self._cached(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
 
 class SQLiteBackend(StorageBackend):
     """SQLite storage backend."""
 
-    def __init__(self, db_path='game_data.db'):
+    def __init__(self, db_path='game_data.db', pool_size=8):
         self.db_path = db_path
-
-    def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        # Idle read connections kept open for reuse across requests
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        # One long-lived connection for all writes. SQLite only admits one
+        # writer at a time, so writers queue on the lock rather than on
+        # busy retries.
+        self._writer = self._connect()
+        self._write_lock = threading.Lock()
+        atexit.register(self.close)
+
+        # Read cache, cleared whenever scores or stats are written
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+
+        # Per-difficulty stats version, bumped by each write; compute_stats
+        # results are memoized per (difficulty, version)
+        self._stats_version = dict.fromkeys(DIFFICULTIES, 0)
+        self._compute_stats_cached = functools.lru_cache(maxsize=3)(self._compute_stats)
+
+        # Each difficulty's stats window as (accuracy, score, wave), oldest
+        # first. Loaded by init() and appended to after each commit, so
+        # reports never read back rows we just wrote. Guarded by
+        # _cache_lock.
+        self._recent_stats = {
+            difficulty: deque(maxlen=STATS_WINDOW)
+            for difficulty in DIFFICULTIES
+        }
+        # Games recorded per difficulty, counting from the loaded window
+        self._games_recorded = dict.fromkeys(DIFFICULTIES, 0)
+
+        # Highest score ever, loaded by init() and kept current by writes
+        self._global_best = None
+
+        # Accuracy reports are printed off the request path by one worker;
+        # a difficulty already waiting for it isn't submitted twice
+        self._report_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='stats-report')
+        self._reports_pending = set()
+        self._reports_lock = threading.Lock()
+        # (games recorded, average accuracy) as of each difficulty's last
+        # printed report; only touched by the report worker
+        self._last_report = {}
+
+    def _connect(self):
+        # Autocommit mode; multi-statement writes use explicit BEGIN/COMMIT.
+        # Pooled connections move between handler threads.
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
         conn.row_factory = sqlite3.Row
+        # Per-connection settings; WAL itself is set once in init(). NORMAL
+        # sync skips the per-commit fsync, which is safe under WAL.
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-20000')
         return conn
 
+    @contextmanager
+    def _get_connection(self):
+        """Borrow a pooled connection, opening a new one if none are idle."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _cached(self, key, compute):
+        """Return the cached value for key, calling compute() on a miss."""
+        now = time.monotonic()
+
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            generation = self._cache_generation
+            if entry and entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        value = compute()
+
+        with self._cache_lock:
+            # Don't store a result computed before a concurrent write
+            if generation == self._cache_generation:
+                self._cache[key] = (now + CACHE_TTL, value)
+                self._cache.move_to_end(key)
+                if len(self._cache) > CACHE_MAX_ENTRIES:
+                    self._cache.popitem(last=False)
+        return value
+
+    def cached_json(self, key, build):
+        """Return build() as encoded JSON bytes, cached alongside other reads."""
+        return self._cached(('json',) + key, lambda: encode_json(build()))
+
+    def _invalidate_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
+
+    @contextmanager
+    def _write_connection(self):
+        """Hold the shared writer connection for the duration of a write."""
+        with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+    def close(self):
+        """Close the writer and all idle pooled connections."""
+        # Let any queued report finish before its connections go away
+        self._report_pool.shutdown(wait=True)
+        with self._write_lock:
+            self._writer.close()
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
     def init(self):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Scores table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_name TEXT DEFAULT 'Anonymous',
-                score INTEGER NOT NULL,
-                wave INTEGER NOT NULL,
-                accuracy REAL,
-                difficulty TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Players table (for future use)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS players (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Index for leaderboard queries
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_scores_score
-            ON scores(score DESC)
-        ''')
-
-        # Per-difficulty stats tables for accuracy tracking
-        for difficulty in ['beginner', 'normal', 'expert']:
-            cursor.execute(f'''
-                CREATE TABLE IF NOT EXISTS stats_{difficulty} (
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+
+            # WAL is stored in the database file, so it only needs setting
+            # once. It lets readers run alongside a writer.
+            cursor.execute('PRAGMA journal_mode=WAL')
+            journal_mode = cursor.fetchone()[0]
+            if journal_mode != 'wal':
+                print(f"Warning: SQLite journal mode is {journal_mode}, not WAL")
+
+            # Scores table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scores (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    accuracy REAL NOT NULL,
+                    player_name TEXT DEFAULT 'Anonymous',
                     score INTEGER NOT NULL,
                     wave INTEGER NOT NULL,
+                    accuracy REAL,
+                    difficulty TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
 
-        conn.commit()
-        conn.close()
-        print(f"SQLite database initialized: {self.db_path}")
+            # Players table (for future use)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS players (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
 
-    def get_high_scores(self, limit=10, difficulty=None):
-        conn = self._get_connection()
-        cursor = conn.cursor()
+            # Index for leaderboard queries
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scores_score
+                ON scores(score DESC)
+            ''')
 
-        if difficulty:
+            # Indexes for per-player and per-difficulty best-score lookups
             cursor.execute('''
-                SELECT id, player_name, score, wave, accuracy, difficulty, created_at
-                FROM scores
-                WHERE difficulty = ?
-                ORDER BY score DESC
-                LIMIT ?
-            ''', (difficulty, limit))
-        else:
+                CREATE INDEX IF NOT EXISTS idx_scores_player_score
+                ON scores(player_name, score DESC)
+            ''')
             cursor.execute('''
-                SELECT id, player_name, score, wave, accuracy, difficulty, created_at
-                FROM scores
-                ORDER BY score DESC
-                LIMIT ?
-            ''', (limit,))
+                CREATE INDEX IF NOT EXISTS idx_scores_difficulty_score
+                ON scores(difficulty, score DESC)
+            ''')
 
-        rows = cursor.fetchall()
-        conn.close()
+            # Pre-encoded top scores per difficulty ('' = all difficulties),
+            # rewritten in the same transaction as each score insert
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS leaderboard_cache (
+                    key TEXT PRIMARY KEY,
+                    json BLOB NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
 
-        return [dict(row) for row in rows]
+            # Accuracy stats read recent games straight from scores
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_scores_difficulty_recent
+                ON scores(difficulty, created_at DESC, id DESC)
+            ''')
 
-    def save_score(self, score, wave, accuracy=None, difficulty=None, player_name=None):
-        conn = self._get_connection()
-        cursor = conn.cursor()
+            for difficulty in DIFFICULTIES:
+                # Older databases copied every game into per-difficulty
+                # stats tables; the same rows are already in scores
+                cursor.execute(f'DROP TABLE IF EXISTS stats_{difficulty}')
+
+                cursor.execute(SQL_SELECT_STATS, (difficulty, STATS_WINDOW))
+                rows = cursor.fetchall()
+                with self._cache_lock:
+                    recent = self._recent_stats[difficulty]
+                    recent.clear()
+                    recent.extend((row['accuracy'], row['score'], row['wave'])
+                                  for row in reversed(rows))
+                    self._games_recorded[difficulty] = len(rows)
+                    self._stats_version[difficulty] += 1
+
+            # Rebuild the leaderboard cache in case scores changed while
+            # the server was down
+            cursor.execute('BEGIN')
+            for key in LEADERBOARD_KEYS:
+                self._refresh_leaderboard(cursor, key)
+            cursor.execute('COMMIT')
+
+            self._global_best = self._fetch_global_best(cursor)
+
+        print(f"SQLite database initialized: {self.db_path}")
+
+    @ttl_cached
+    def get_high_scores(self, limit=10, difficulty=None):
+        with self._get_connection() as conn:
+            return self._fetch_high_scores(conn.cursor(), limit, difficulty)
+
+    @ttl_cached
+    def get_high_scores_json(self, limit=10, difficulty=None):
+        """Get top high scores as an encoded JSON list.
+
+        The default-sized leaderboard for a known difficulty is read straight
+        from leaderboard_cache.
+        """
+        if limit == LEADERBOARD_SIZE and (difficulty or '') in LEADERBOARD_KEYS:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SQL_LOAD_LEADERBOARD, (difficulty or '',))
+                row = cursor.fetchone()
+            # No cached row means init() hasn't run yet
+            return row[0] if row else b'[]'
+
+        return encode_json(self.get_high_scores(limit=limit, difficulty=difficulty))
+
+    def _fetch_high_scores(self, cursor, limit, difficulty):
+        if difficulty:
+            cursor.execute(SQL_TOP_SCORES_BY_DIFFICULTY, (difficulty, limit))
+        else:
+            cursor.execute(SQL_TOP_SCORES, (limit,))
 
-        cursor.execute('''
-            INSERT INTO scores (player_name, score, wave, accuracy, difficulty)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (player_name or 'Anonymous', score, wave, accuracy, difficulty))
+        return [dict(row) for row in cursor.fetchall()]
 
-        score_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+    def _refresh_leaderboard(self, cursor, key):
+        scores = self._fetch_high_scores(cursor, LEADERBOARD_SIZE, key or None)
+        cursor.execute(SQL_STORE_LEADERBOARD, (key, encode_json(scores)))
 
-        return score_id
+    def save_score(self, score, wave, accuracy=None, difficulty=None, player_name=None):
+        score_ids, best = self.save_scores_bulk([{
+            'score': score,
+            'wave': wave,
+            'accuracy': accuracy,
+            'difficulty': difficulty,
+            'player_name': player_name,
+        }])
+        return score_ids[0], best
+
+    def save_scores_bulk(self, records):
+        """Save several scores in one transaction.
+
+        Each record is a dict of save_score's keyword arguments. Returns
+        (list of score IDs in record order, current global best).
+        """
+        rows = [
+            (r.get('player_name') or 'Anonymous', r['score'], r['wave'],
+             r.get('accuracy'), r.get('difficulty'))
+            for r in records
+        ]
+
+        # Games that count towards a difficulty's accuracy stats
+        stats_rows = {}
+        for _, score, wave, accuracy, difficulty in rows:
+            if difficulty in DIFFICULTIES and accuracy is not None:
+                stats_rows.setdefault(difficulty, []).append((accuracy, score, wave))
+
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+
+            # Insert and read back the best score in one write transaction
+            cursor.execute('BEGIN IMMEDIATE')
+
+            if len(rows) == 1:
+                # A lone insert reports its id through lastrowid directly
+                cursor.execute(SQL_INSERT_SCORE, rows[0])
+                last_id = cursor.lastrowid
+            else:
+                cursor.executemany(SQL_INSERT_SCORE, rows)
+
+                # IDs are allocated consecutively within a write transaction
+                cursor.execute('SELECT last_insert_rowid()')
+                last_id = cursor.fetchone()[0]
+
+            # Only look the best up again if this batch could have beaten it
+            best = self._global_best
+            if self._may_beat_best(row[1] for row in rows):
+                best = self._fetch_global_best(cursor)
+
+            self._refresh_leaderboard(cursor, '')
+            for difficulty in {row[4] for row in rows} & DIFFICULTIES:
+                self._refresh_leaderboard(cursor, difficulty)
+
+            cursor.execute('COMMIT')
+            self._global_best = best
+
+            # Still under the write lock, so the windows see commits in order
+            if stats_rows:
+                with self._cache_lock:
+                    for difficulty, stats in stats_rows.items():
+                        self._recent_stats[difficulty].extend(stats)
+                        self._games_recorded[difficulty] += len(stats)
+                        self._stats_version[difficulty] += 1
+        self._invalidate_cache()
+        return list(range(last_id - len(rows) + 1, last_id + 1)), best
 
     def get_player_best(self, player_name):
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT id, player_name, score, wave, accuracy, difficulty, created_at
-            FROM scores
-            WHERE player_name = ?
-            ORDER BY score DESC
-            LIMIT 1
-        ''', (player_name,))
+            cursor.execute(SQL_PLAYER_BEST, (player_name,))
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
 
         return dict(row) if row else None
 
-    def get_global_best(self):
-        """Get the single highest score ever."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT id, player_name, score, wave, accuracy, difficulty, created_at
-            FROM scores
-            ORDER BY score DESC
-            LIMIT 1
-        ''')
+    def _fetch_global_best(self, cursor):
+        cursor.execute(SQL_GLOBAL_BEST)
 
         row = cursor.fetchone()
-        conn.close()
-
         return dict(row) if row else None
 
-    def save_stats(self, accuracy, score, wave, difficulty):
-        """Save game stats and prune to most recent 200 games."""
-        if difficulty not in ['beginner', 'normal', 'expert']:
-            return
+    def _may_beat_best(self, scores):
+        best = self._global_best
+        if best is None or not isinstance(best['score'], (int, float)):
+            return True
+        # Ties go back to SQL so it picks between equal scores as before.
+        # Scores are client-supplied, so anything non-numeric does too.
+        return any(not isinstance(score, (int, float)) or score >= best['score']
+                   for score in scores)
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        table = f'stats_{difficulty}'
-
-        # Insert new record
-        cursor.execute(f'''
-            INSERT INTO {table} (accuracy, score, wave)
-            VALUES (?, ?, ?)
-        ''', (accuracy, score, wave))
-
-        # Prune to most recent 200 games
-        cursor.execute(f'''
-            DELETE FROM {table}
-            WHERE id NOT IN (
-                SELECT id FROM {table}
-                ORDER BY created_at DESC
-                LIMIT 200
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+    def get_global_best(self):
+        """Get the single highest score ever."""
+        return self._global_best
 
     def get_stats(self, difficulty):
         """Get all stats for a difficulty level."""
-        if difficulty not in ['beginner', 'normal', 'expert']:
+        if difficulty not in DIFFICULTIES:
             return []
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        table = f'stats_{difficulty}'
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(f'''
-            SELECT accuracy, score, wave, created_at
-            FROM {table}
-            ORDER BY created_at DESC
-        ''')
+            cursor.execute(SQL_SELECT_STATS, (difficulty, STATS_WINDOW))
 
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
 
         return [dict(row) for row in rows]
 
     def compute_stats(self, difficulty):
         """Compute accuracy statistics and return as a dict."""
-        stats = self.get_stats(difficulty)
-        if not stats:
+        if difficulty not in DIFFICULTIES:
             return None
 
-        accuracies = [s['accuracy'] for s in stats if s['accuracy'] is not None]
-        scores = [s['score'] for s in stats]
-        waves = [s['wave'] for s in stats]
-        if not accuracies:
+        # Results only change when a write bumps the version
+        return self._compute_stats_cached(difficulty, self._stats_version[difficulty])
+
+    def _compute_stats(self, difficulty, version):
+        with self._cache_lock:
+            window = list(self._recent_stats[difficulty])
+
+        n = len(window)
+        if not n:
             return None
 
-        n = len(accuracies)
+        accuracies = [accuracy for accuracy, _, _ in window]
+        scores = [score for _, score, _ in window]
+        waves = [wave for _, _, wave in window]
+
+        # Sort once; percentiles, min, max and the bucket edges all read it
         sorted_acc = sorted(accuracies)
 
-        avg = statistics.mean(accuracies)
-        median = statistics.median(accuracies)
-        stdev = statistics.stdev(accuracies) if n > 1 else 0
-        min_acc = min(accuracies)
-        max_acc = max(accuracies)
+        avg = math.fsum(accuracies) / n
+        if n > 1:
+            stdev = math.sqrt(math.fsum((a - avg) ** 2 for a in accuracies) / (n - 1))
+        else:
+            stdev = 0
 
-        def percentile(data, p):
-            k = (len(data) - 1) * (p / 100)
+        def percentile(p):
+            # Linear interpolation between the two nearest ranks
+            k = (n - 1) * p
             f = int(k)
-            c = f + 1 if f + 1 < len(data) else f
-            return data[f] + (data[c] - data[f]) * (k - f)
+            c = min(f + 1, n - 1)
+            return sorted_acc[f] + (sorted_acc[c] - sorted_acc[f]) * (k - f)
+
+        # Counts below each bucket edge, found by binary search
+        below_80, below_90, below_95, below_97 = (
+            bisect_left(sorted_acc, edge) for edge in (80, 90, 95, 97)
+        )
 
         result = {
             'difficulty': difficulty,
             'games': n,
             'accuracy': {
                 'avg': round(avg, 1),
-                'median': round(median, 1),
+                'median': round(percentile(0.50), 1),
                 'stdev': round(stdev, 1),
-                'min': round(min_acc, 1),
-                'max': round(max_acc, 1),
+                'min': round(sorted_acc[0], 1),
+                'max': round(sorted_acc[-1], 1),
             },
             'percentiles': {
-                'p10': round(percentile(sorted_acc, 10), 1),
-                'p25': round(percentile(sorted_acc, 25), 1),
-                'p75': round(percentile(sorted_acc, 75), 1),
-                'p90': round(percentile(sorted_acc, 90), 1),
-                'p95': round(percentile(sorted_acc, 95), 1),
+                'p10': round(percentile(0.10), 1),
+                'p25': round(percentile(0.25), 1),
+                'p75': round(percentile(0.75), 1),
+                'p90': round(percentile(0.90), 1),
+                'p95': round(percentile(0.95), 1),
             },
             'distribution': {
-                '97-100': len([a for a in accuracies if a >= 97]),
-                '95-97': len([a for a in accuracies if 95 <= a < 97]),
-                '90-95': len([a for a in accuracies if 90 <= a < 95]),
-                '80-90': len([a for a in accuracies if 80 <= a < 90]),
-                'below_80': len([a for a in accuracies if a < 80]),
+                '97-100': n - below_97,
+                '95-97': below_97 - below_95,
+                '90-95': below_95 - below_90,
+                '80-90': below_90 - below_80,
+                'below_80': below_80,
             },
             'score': {
-                'avg': round(statistics.mean(scores)),
+                'avg': round(sum(scores) / n),
                 'max': max(scores),
             },
             'wave': {
-                'avg': round(statistics.mean(waves), 1),
+                'avg': round(sum(waves) / n, 1),
                 'max': max(waves),
             },
         }
 
         if n >= 20:
-            recent_10 = statistics.mean(accuracies[:10])
-            prev_10 = statistics.mean(accuracies[10:20])
+            # The window is oldest first, so the newest games are at the end
+            recent_10 = math.fsum(accuracies[-10:]) / 10
+            prev_10 = math.fsum(accuracies[-20:-10]) / 10
             result['trend'] = round(recent_10 - prev_10, 1)
 
         return result
 
+    def queue_accuracy_report(self, difficulty):
+        """Schedule print_accuracy_stats on the background report worker."""
+        with self._reports_lock:
+            if difficulty in self._reports_pending:
+                return
+            self._reports_pending.add(difficulty)
+        self._report_pool.submit(self._run_accuracy_report, difficulty)
+
+    def _run_accuracy_report(self, difficulty):
+        with self._reports_lock:
+            self._reports_pending.discard(difficulty)
+        try:
+            if self._report_due(difficulty):
+                self.print_accuracy_stats(difficulty)
+        except Exception as e:
+            print(f"[STATS] Failed to compute {difficulty} report: {e}")
+
+    def _report_due(self, difficulty):
+        """Whether enough has changed since the last report to print another."""
+        if difficulty not in DIFFICULTIES:
+            return True
+
+        with self._cache_lock:
+            accuracies = [accuracy for accuracy, _, _ in self._recent_stats[difficulty]]
+            games = self._games_recorded[difficulty]
+        if not accuracies:
+            return True
+        avg = math.fsum(accuracies) / len(accuracies)
+
+        last = self._last_report.get(difficulty)
+        if (last and games // REPORT_EVERY_GAMES == last[0] // REPORT_EVERY_GAMES
+                and abs(avg - last[1]) <= REPORT_AVG_SHIFT):
+            return False
+
+        self._last_report[difficulty] = (games, avg)
+        return True
+
     def print_accuracy_stats(self, difficulty):
         """Compute and print accuracy statistics to stdout."""
         result = self.compute_stats(difficulty)
@@ -314,142 +718,314 @@ class SQLiteBackend(StorageBackend):
         d = result['distribution']
         n = result['games']
 
-        print(f"\n{'='*60}")
-        print(f"[STATS] {difficulty.upper()} - Accuracy Report ({n} games)")
-        print(f"{'='*60}")
-        print(f"  Average: {a['avg']:.1f}%  |  Median: {a['median']:.1f}%  |  StdDev: {a['stdev']:.1f}%")
-        print(f"  Min: {a['min']:.1f}%  |  Max: {a['max']:.1f}%")
-        print(f"  Percentiles: P10={p['p10']:.1f}% P25={p['p25']:.1f}% P75={p['p75']:.1f}% P90={p['p90']:.1f}% P95={p['p95']:.1f}%")
-        print(f"  Distribution: {d}")
+        lines = [
+            f"\n{'='*60}",
+            f"[STATS] {difficulty.upper()} - Accuracy Report ({n} games)",
+            f"{'='*60}",
+            f"  Average: {a['avg']:.1f}%  |  Median: {a['median']:.1f}%  |  StdDev: {a['stdev']:.1f}%",
+            f"  Min: {a['min']:.1f}%  |  Max: {a['max']:.1f}%",
+            f"  Percentiles: P10={p['p10']:.1f}% P25={p['p25']:.1f}% P75={p['p75']:.1f}% P90={p['p90']:.1f}% P95={p['p95']:.1f}%",
+            f"  Distribution: {d}",
+        ]
         if 'trend' in result:
-            print(f"  Trend (last 10 vs prev 10): {result['trend']:+.1f}%")
-        print(f"{'='*60}\n")
+            lines.append(f"  Trend (last 10 vs prev 10): {result['trend']:+.1f}%")
+        lines.append(f"{'='*60}\n")
+
+        # One write, so request log lines can't land in the middle
+        print('\n'.join(lines))
 
 
 # =============================================================================
 # HTTP Request Handler
 # =============================================================================
 
+class ScoreBatcher:
+    """Coalesces score submissions that arrive together into bulk writes.
+
+    Handler threads block in submit() while a single flusher thread saves
+    everything queued so far (up to max_batch) with one save_scores_bulk call,
+    so a burst of end-of-game POSTs shares one transaction.
+    """
+
+    def __init__(self, storage, max_batch=64):
+        self.storage = storage
+        self.max_batch = max_batch
+        # Bounded in practice by GameServer's cap on concurrent requests
+        self._pending = deque()
+        self._wakeup = threading.Condition()
+        threading.Thread(target=self._flush_forever, daemon=True).start()
+
+    def submit(self, record):
+        """Queue a score and wait until it is saved. Returns (score ID, best)."""
+        future = Future()
+        with self._wakeup:
+            self._pending.append((record, future))
+            self._wakeup.notify()
+        return future.result()
+
+    def _flush_forever(self):
+        while True:
+            with self._wakeup:
+                while not self._pending:
+                    self._wakeup.wait()
+                count = min(len(self._pending), self.max_batch)
+                batch = [self._pending.popleft() for _ in range(count)]
+
+            try:
+                score_ids, best = self.storage.save_scores_bulk([record for record, _ in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # Save one at a time so one bad record only fails its own request
+                for record, future in batch:
+                    try:
+                        score_ids, best = self.storage.save_scores_bulk([record])
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result((score_ids[0], best))
+            else:
+                for (_, future), score_id in zip(batch, score_ids):
+                    future.set_result((score_id, best))
+
+
+# Directory static files are served from, resolved once at import
+STATIC_DIR = os.path.dirname(os.path.abspath(__file__)) or '.'
+
+
+# Range of SQLite's signed 64-bit INTEGER
+SQLITE_INT_MIN = -2 ** 63
+SQLITE_INT_MAX = 2 ** 63 - 1
+
+
+# Headers every API response carries, encoded once
+CORS_HEADERS = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type\r\n'
+)
+JSON_CONTENT_TYPE = b'Content-Type: application/json\r\n'
+
+
+def parse_query(query_string):
+    """Parse a query string into {name: first value}, skipping blank values.
+
+    The API only reads single-valued parameters, so this avoids the lists
+    parse_qs builds for every key.
+    """
+    query = {}
+    if not query_string:
+        return query
+    for field in query_string.split('&'):
+        name, sep, value = field.partition('=')
+        if sep and value:
+            query.setdefault(unquote_plus(name), unquote_plus(value))
+    return query
+
+
 class GameServerHandler(SimpleHTTPRequestHandler):
     """HTTP handler that serves static files and API endpoints."""
 
+    # Keep connections open between requests; every response must therefore
+    # carry a Content-Length
+    protocol_version = 'HTTP/1.1'
+    # Close idle keep-alive connections so they don't pin a thread forever
+    timeout = 30
+    # Send small JSON responses immediately instead of waiting on Nagle
+    disable_nagle_algorithm = True
+
     storage = None  # Set by server setup
+    score_batcher = None  # Set by server setup
+    static_cache = {}  # Set by server setup
 
     def __init__(self, *args, **kwargs):
         # Set directory to serve static files from
-        super().__init__(*args, directory=os.path.dirname(os.path.abspath(__file__)) or '.', **kwargs)
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
 
     def do_GET(self):
-        parsed = urlparse(self.path)
-
-        if parsed.path.startswith('/api/'):
-            self.handle_api_get(parsed)
-        else:
-            # Serve static files
+        path, _, query_string = self.path.partition('?')
+
+        if path.startswith('/api/'):
+            # Only backend work takes a slot; slow clients streaming
+            # static files shouldn't starve the API
+            with self.server.request_slots:
+                self.handle_api_get(path, query_string)
+        elif not self.send_cached_static(path):
+            # Serve static files that aren't preloaded from disk
             super().do_GET()
 
+    def send_cached_static(self, path):
+        """Serve a file from the preloaded static cache. Returns False on a miss."""
+        asset = self.static_cache.get(unquote(path))
+        if asset is None:
+            return False
+        raw, gzipped, content_type, etag = asset
+
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return True
+
+        body = raw
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if gzipped is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzipped
+                self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
     def do_POST(self):
-        parsed = urlparse(self.path)
+        path, _, _ = self.path.partition('?')
 
-        if parsed.path.startswith('/api/'):
-            self.handle_api_post(parsed)
+        if path.startswith('/api/'):
+            with self.server.request_slots:
+                self.handle_api_post(path)
         else:
             self.send_error(405, 'Method Not Allowed')
 
     def do_OPTIONS(self):
         # Handle CORS preflight
-        self.send_response(200)
-        self.send_cors_headers()
-        self.end_headers()
-
-    def send_cors_headers(self):
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_cors_response(200)
+
+    def send_cors_response(self, status, headers=b'', body=b''):
+        """Send a complete response with the CORS headers in one write.
+
+        headers is pre-encoded header lines. This builds the same status
+        line, Server and Date headers as send_response, so the whole
+        response goes out in a single socket write.
+        """
+        self.log_request(status)
+        phrase = self.responses[status][0] if status in self.responses else ''
+        head = '%s %d %s\r\nServer: %s\r\nDate: %s\r\n' % (
+            self.protocol_version, status, phrase,
+            self.version_string(), self.date_time_string())
+        self.wfile.write(b'%s%s%sContent-Length: %d\r\n\r\n%s' % (
+            head.encode('latin-1'), headers, CORS_HEADERS, len(body), body))
 
     def send_json(self, data, status=200):
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json')
-        self.send_cors_headers()
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
-
-    def handle_api_get(self, parsed):
-        path = parsed.path
-        query = parse_qs(parsed.query)
-
-        if path == '/api/scores':
-            # Get high scores
-            limit = int(query.get('limit', [10])[0])
-            difficulty = query.get('difficulty', [None])[0]
-            scores = self.storage.get_high_scores(limit=limit, difficulty=difficulty)
-            self.send_json({'scores': scores})
+        # Already-encoded payloads (e.g. from the storage cache) go out as-is
+        payload = data if isinstance(data, bytes) else encode_json(data)
+        self.send_cors_response(status, JSON_CONTENT_TYPE, payload)
 
-        elif path == '/api/scores/best':
-            # Get global best score
-            best = self.storage.get_global_best()
-            self.send_json({'best': best})
+    def handle_api_get(self, path, query_string):
+        query = parse_query(query_string)
 
+        handler = self.API_GET_ROUTES.get(path)
+        if handler:
+            handler(self, query)
         elif path.startswith('/api/scores/player/'):
             # Get player's best score
-            player_name = path.split('/')[-1]
-            best = self.storage.get_player_best(player_name)
-            self.send_json({'best': best})
-
-        elif path == '/api/stats':
-            # Get computed stats for a difficulty
-            difficulty = query.get('difficulty', [None])[0]
-            if not difficulty or difficulty not in ['beginner', 'normal', 'expert']:
-                self.send_json({'error': 'Missing or invalid difficulty parameter'}, 400)
-                return
-            result = self.storage.compute_stats(difficulty)
-            self.send_json({'stats': result})
-
+            _, _, player_name = path.rpartition('/')
+            player_name = unquote(player_name)
+            self.send_json(self.storage.cached_json(
+                ('player', player_name),
+                lambda: {'best': self.storage.get_player_best(player_name)}
+            ))
         else:
             self.send_json({'error': 'Not found'}, 404)
 
-    def handle_api_post(self, parsed):
-        path = parsed.path
-
+    def api_get_scores(self, query):
+        # Get high scores
+        limit = int(query.get('limit', 10))
+        difficulty = query.get('difficulty')
+        scores = self.storage.get_high_scores_json(limit=limit, difficulty=difficulty)
+        self.send_json(b'{"scores":' + scores + b'}')
+
+    def api_get_best(self, query):
+        # Get global best score
+        self.send_json(self.storage.cached_json(
+            ('best',),
+            lambda: {'best': self.storage.get_global_best()}
+        ))
+
+    def api_get_stats(self, query):
+        # Get computed stats for a difficulty
+        difficulty = query.get('difficulty')
+        if difficulty not in DIFFICULTIES:
+            self.send_json({'error': 'Missing or invalid difficulty parameter'}, 400)
+            return
+        self.send_json(self.storage.cached_json(
+            ('stats', difficulty),
+            lambda: {'stats': self.storage.compute_stats(difficulty)}
+        ))
+
+    # Exact-match GET endpoints; /api/scores/player/<name> is matched by prefix
+    API_GET_ROUTES = {
+        '/api/scores': api_get_scores,
+        '/api/scores/best': api_get_best,
+        '/api/stats': api_get_stats,
+    }
+
+    def handle_api_post(self, path):
         # Read request body
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length)
 
         try:
-            data = json.loads(body) if body else {}
-        except json.JSONDecodeError:
+            data = decode_json(body) if body else {}
+        except ValueError:
+            # Both json and orjson decode errors subclass ValueError
             self.send_json({'error': 'Invalid JSON'}, 400)
             return
 
         if path == '/api/scores':
             # Save a new score
             required = ['score', 'wave']
-            if not all(k in data for k in required):
+            if not isinstance(data, dict) or not all(k in data for k in required):
                 self.send_json({'error': 'Missing required fields: score, wave'}, 400)
                 return
 
-            score_id = self.storage.save_score(
-                score=data['score'],
-                wave=data['wave'],
-                accuracy=data.get('accuracy'),
-                difficulty=data.get('difficulty'),
-                player_name=data.get('player_name')
-            )
+            # Stats are computed in Python from these values, so they must
+            # be real numbers rather than whatever the client sent
+            try:
+                score = int(data['score'])
+                wave = int(data['wave'])
+            except (TypeError, ValueError, OverflowError):
+                score = wave = None
+            # SQLite INTEGER is 64-bit; bigger values fail the whole insert
+            if not all(v is not None and SQLITE_INT_MIN <= v <= SQLITE_INT_MAX
+                       for v in (score, wave)):
+                self.send_json({'error': 'score and wave must be numbers'}, 400)
+                return
 
-            # Save stats for accuracy tracking and print report
-            difficulty = data.get('difficulty')
             accuracy = data.get('accuracy')
+            if accuracy is not None:
+                try:
+                    accuracy = float(accuracy)
+                except (TypeError, ValueError):
+                    accuracy = math.nan
+                if not math.isfinite(accuracy):
+                    self.send_json({'error': 'accuracy must be a number'}, 400)
+                    return
+
+            # Reject bad records here; once batched they'd share a transaction
+            difficulty = data.get('difficulty')
+            player_name = data.get('player_name')
+            if not all(v is None or isinstance(v, str) for v in (difficulty, player_name)):
+                self.send_json({'error': 'difficulty and player_name must be strings'}, 400)
+                return
+
+            score_id, best = self.score_batcher.submit({
+                'score': score,
+                'wave': wave,
+                'accuracy': accuracy,
+                'difficulty': difficulty,
+                'player_name': player_name,
+            })
+
+            # Stats were saved with the score; print the accuracy report
             if difficulty and accuracy is not None:
-                self.storage.save_stats(
-                    accuracy=accuracy,
-                    score=data['score'],
-                    wave=data['wave'],
-                    difficulty=difficulty
-                )
-                self.storage.print_accuracy_stats(difficulty)
+                self.storage.queue_accuracy_report(difficulty)
 
-            # Return the new score and current best
-            best = self.storage.get_global_best()
+            # Return the new score and the best as of its insert
             self.send_json({
                 'id': score_id,
                 'saved': True,
@@ -460,8 +1036,8 @@ class GameServerHandler(SimpleHTTPRequestHandler):
             self.send_json({'error': 'Not found'}, 404)
 
     def log_message(self, format, *args):
-        # Custom log format
-        if '/api/' in args[0]:
+        # Custom log format (log_error passes the status code, not the request line)
+        if isinstance(args[0], str) and '/api/' in args[0]:
             print(f"[API] {args[0]} - {args[1]}")
         # Suppress static file logs for cleaner output
 
@@ -470,6 +1046,58 @@ class GameServerHandler(SimpleHTTPRequestHandler):
 # Server Setup
 # =============================================================================
 
+class GameServer(ThreadingHTTPServer):
+    """Threaded HTTP server that caps the number of requests handled at once."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    # Listen backlog; the socketserver default of 5 drops connections when a
+    # page load opens many at once
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, max_concurrent=32):
+        super().__init__(server_address, handler_class)
+        # Each connection gets its own thread; this bounds how many of them
+        # are doing API and database work at the same time.
+        self.request_slots = threading.BoundedSemaphore(max_concurrent)
+
+
+# Static assets preloaded (and gzipped) at startup. Images and music are
+# already compressed and large, so they are still streamed from disk.
+STATIC_CACHE_TYPES = {'.html', '.js', '.css', '.json', '.svg', '.txt'}
+
+
+def build_static_cache(directory):
+    """Load static text assets under directory into memory.
+
+    Returns {url_path: (raw, gzipped or None, content_type, etag)}. Files are
+    read once, so edits need a server restart to show up.
+    """
+    cache = {}
+    for root, dirs, files in os.walk(directory):
+        # Skip .git and other hidden directories
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if os.path.splitext(name)[1] not in STATIC_CACHE_TYPES:
+                continue
+            file_path = os.path.join(root, name)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+
+            gzipped = gzip.compress(raw, 9)
+            if len(gzipped) >= len(raw):
+                gzipped = None
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            etag = '"%s"' % hashlib.sha1(raw).hexdigest()
+
+            url_path = '/' + os.path.relpath(file_path, directory).replace(os.sep, '/')
+            cache[url_path] = (raw, gzipped, content_type, etag)
+
+    if '/index.html' in cache:
+        cache['/'] = cache['/index.html']
+    return cache
+
+
 def run_server(port=8000):
     # Initialize storage backend
     storage = SQLiteBackend()
@@ -477,9 +1105,11 @@ def run_server(port=8000):
 
     # Set storage on handler class
     GameServerHandler.storage = storage
+    GameServerHandler.score_batcher = ScoreBatcher(storage)
+    GameServerHandler.static_cache = build_static_cache(STATIC_DIR)
 
     # Create and run server
-    server = HTTPServer(('', port), GameServerHandler)
+    server = GameServer(('', port), GameServerHandler)
     print(f"\n🎮 QWERTY Command Server")
     print(f"   http://localhost:{port}")
     print(f"   Press Ctrl+C to stop\n")